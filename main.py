@@ -3,6 +3,27 @@ import cv2                  # OpenCV for image processing
 import numpy as np           # Numerical operations
 import pytesseract           # OCR (Optical Character Recognition)
 import re                    # Regular expressions for text cleaning
+import queue                 # Hand-off of images to the writer thread
+import threading             # Background image writer
+from collections import OrderedDict                 # LRU cache of OCR results
+from concurrent.futures import ThreadPoolExecutor   # Parallel OCR calls
+
+# tesserocr keeps Tesseract loaded in-process between calls; without it
+# every OCR call goes through pytesseract (one tesseract process per call)
+try:
+    from tesserocr import PyTessBaseAPI, PSM, OEM
+except ImportError:
+    PyTessBaseAPI = None
+
+# Numba compiles the contour filter to machine code; without it the
+# same function simply runs as plain Python
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
 
 
 # ---------- OPTIONAL: Configure Tesseract path ----------
@@ -13,135 +34,350 @@ import re                    # Regular expressions for text cleaning
 # pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
 
 
+# Characters that can appear on a plate (OCR whitelist)
+PLATE_CHARS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+
+# Compiled once: strips everything except capital letters and digits
+# from OCR output
+_PLATE_RE = re.compile(r'[^A-Z0-9]')
+
+# Real-time loop: plates barely move between adjacent frames, so only run
+# detection every N frames, or sooner when the scene changes noticeably
+DETECT_EVERY_N_FRAMES = 3
+MOTION_THRESHOLD = 8.0       # Mean abs. difference on a 160x90 gray thumbnail
+
+# Number of recent OCR results remembered across frames
+OCR_CACHE_SIZE = 128
+
+
+# Explicit signature: compiled at import rather than stalling the
+# first frame of the camera loop
+@njit('boolean[:](int32[:, :], float32[:], float64)')
+def filter_candidates(rects, areas, min_area):
+    """
+    Return a boolean mask of contours that look like a plate:
+    bounding box aspect ratio 1.5–8.0 and contour area >= min_area
+    """
+    keep = np.zeros(rects.shape[0], dtype=np.bool_)
+    for i in range(rects.shape[0]):
+        aspect_ratio = rects[i, 2] / rects[i, 3]
+        keep[i] = 1.5 <= aspect_ratio <= 8.0 and areas[i] >= min_area
+    return keep
+
+
+def largest_contours(cnts, k):
+    """
+    Return the k largest contours (largest first) and their areas.
+    Each area is computed once; the top k are partially selected
+    and only those are sorted.
+    """
+    if not cnts:
+        return [], np.empty(0, dtype=np.float32)
+
+    areas = np.fromiter(
+        (cv2.contourArea(c) for c in cnts),
+        dtype=np.float32, count=len(cnts)
+    )
+    k = min(k, len(cnts))
+    idx = np.argpartition(-areas, k - 1)[:k]
+    idx = idx[np.argsort(-areas[idx])]
+    return [cnts[i] for i in idx], areas[idx]
+
+
+def dedupe_by_text(results):
+    """
+    Drop results whose text was already seen, keeping the first
+    (largest contour) result for each text in its original order
+    """
+    unique_results = {}
+    for r in results:
+        unique_results.setdefault(r['text'], r)
+    return list(unique_results.values())
+
+
+def histogram_median(img):
+    """
+    Median of a uint8 image (numpy array or UMat), same value as
+    np.median. Only the 256-bin histogram leaves the device, not
+    the image itself.
+    """
+    hist = cv2.calcHist([img], [0], None, [256], [0, 256])
+    if isinstance(hist, cv2.UMat):
+        hist = hist.get()
+
+    # Bins holding the lower and upper middle pixel (the same bin for
+    # an odd pixel count); the median is their average
+    cdf = np.cumsum(hist.ravel())
+    count = cdf[-1]
+    lower = np.searchsorted(cdf, (count + 1) // 2)
+    upper = np.searchsorted(cdf, count // 2 + 1)
+    return (lower + upper) / 2
+
+
+def adaptive_threshold(src, kernel, c, mean=None, dst=None):
+    """
+    Same output as cv2.adaptiveThreshold(src, 255,
+    ADAPTIVE_THRESH_GAUSSIAN_C, THRESH_BINARY, block, c) for a
+    uint8 image, a cv2.getGaussianKernel(block, 0) kernel and an
+    integer c >= 1, using a separable filter instead.
+    mean and dst are optional preallocated buffers.
+    """
+    # Gaussian-weighted local mean
+    mean = cv2.sepFilter2D(
+        src, -1, kernel, kernel,
+        dst=mean, borderType=cv2.BORDER_REPLICATE
+    )
+
+    # src > mean - c  <=>  (mean - src) < c; the saturating subtract
+    # clamps negatives to 0, which is still < c, so nothing is lost
+    cv2.subtract(mean, src, dst=mean)
+    _, dst = cv2.threshold(mean, c - 1, 255, cv2.THRESH_BINARY_INV, dst=dst)
+    return dst
+
+
 class RobustLicensePlateRecognizer:
     def __init__(self):
         """
         Constructor:
         - OCR configuration
         - CLAHE object for contrast enhancement
+        - Thread pool for running OCR off the camera loop
+        - Cache of recent OCR results
         """
         # OCR configuration:
         # --oem 3 : Default OCR engine
         # --psm 7 : Treat image as a single line of text
         # whitelist : Allow only capital letters and numbers
         self.custom_config = (
-            r'--oem 3 --psm 7 '
-            r'-c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+            f'--oem 3 --psm 7 -c tessedit_char_whitelist={PLATE_CHARS}'
         )
 
         # CLAHE improves contrast in low-light or shadow areas
         self.clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
 
+        # Adaptive threshold settings: Gaussian-weighted local mean over an
+        # 11x11 block, pixel is white if brighter than (mean - 2)
+        self._threshold_kernel = cv2.getGaussianKernel(11, 0, cv2.CV_32F)
+        self._threshold_c = 2
+
+        # Tesseract does its work outside the GIL, so OCR calls overlap
+        # well in threads
+        self.ocr_pool = ThreadPoolExecutor(max_workers=4)
+
+        # tesserocr API handles are not thread-safe: each worker thread
+        # gets its own
+        self._tess_local = threading.local()
+        self._tess_apis = []
+
+        # Recent OCR results keyed by an 8x8 thumbnail of the binarized ROI;
+        # overlapping contours and a stationary car hit the same entries
+        self._ocr_cache = OrderedDict()
+
+        # Preprocessing buffers, allocated on the first frame
+        # (see _ensure_buffers)
+        self._buffer_shape = None
+
 
     def get_contours(self, img):
         """
         Preprocess image and extract contours
         """
-        # Convert image to grayscale
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        # Upload once: the whole filter chain below runs on UMat buffers, which
+        # use the OpenCL device (e.g. an integrated GPU) when one is available
+        frame = cv2.UMat(img)
+
+        # Reuse the same buffers every frame instead of allocating new ones
+        self._ensure_buffers(img.shape)
+
+        # Convert image to grayscale (full resolution, kept for OCR crops)
+        gray_full = cv2.cvtColor(
+            frame, cv2.COLOR_BGR2GRAY, dst=self._gray_full
+        )
+
+        # Downscale once so every per-pixel filter below touches
+        # 4x fewer pixels
+        small = cv2.pyrDown(gray_full, dst=self._small)
 
         # Apply CLAHE to improve contrast
-        gray = self.clahe.apply(gray)
+        gray = self.clahe.apply(small, dst=self._contrast)
 
-        # Bilateral filter reduces noise but keeps edges sharp
-        blur = cv2.bilateralFilter(gray, 11, 17, 17)
+        # Gaussian blur reduces noise; CLAHE already normalized the contrast,
+        # so the (much slower) edge-preserving bilateral filter isn't needed
+        blur = cv2.GaussianBlur(gray, (5, 5), 0, dst=self._blur)
 
         # Adaptive threshold handles uneven lighting
-        thresh = cv2.adaptiveThreshold(
-            blur, 255,
-            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-            cv2.THRESH_BINARY,
-            11, 2
+        thresh = adaptive_threshold(
+            blur, self._threshold_kernel, self._threshold_c,
+            mean=self._local_mean, dst=self._thresh
         )
 
-        # Canny edge detection finds strong edges
-        edged = cv2.Canny(blur, 30, 200)
+        # Canny edge detection finds strong edges; thresholds follow the
+        # median brightness so edge count stays stable as lighting changes
+        median = histogram_median(blur)
+        lower = int(max(0, 0.66 * median))
+        upper = int(min(255, 1.33 * median))
+        edged = cv2.Canny(blur, lower, upper, edges=self._edged)
 
         # Combine threshold + edge detection
-        combined = cv2.bitwise_or(thresh, edged)
+        combined = cv2.bitwise_or(thresh, edged, dst=self._combined)
 
         # Find contours in the processed image
+        # (CPU only; .get() downloads a copy)
         cnts, _ = cv2.findContours(
-            combined.copy(),
+            combined.get(),
             cv2.RETR_TREE,
             cv2.CHAIN_APPROX_SIMPLE
         )
 
-        # Return largest contours first + grayscale image
-        return sorted(cnts, key=cv2.contourArea, reverse=True)[:30], gray
+        # Keep only the 30 largest contours
+        largest, largest_areas = largest_contours(cnts, 30)
+
+        # Return largest contours first + their areas + downscale factor
+        # + full grayscale image
+        return (
+            largest,
+            largest_areas,
+            2,
+            gray_full.get()
+        )
+
+
+    def _ensure_buffers(self, shape):
+        """
+        (Re)allocate the preprocessing buffers when the frame size changes
+        """
+        if shape == self._buffer_shape:
+            return
+
+        height, width = shape[:2]
+        small_height, small_width = (height + 1) // 2, (width + 1) // 2
+
+        self._gray_full = cv2.UMat(height, width, cv2.CV_8UC1)
+        (
+            self._small, self._contrast, self._blur, self._local_mean,
+            self._thresh, self._edged, self._combined
+        ) = (
+            cv2.UMat(small_height, small_width, cv2.CV_8UC1)
+            for _ in range(7)
+        )
+        self._buffer_shape = shape
 
 
     def process_image(self, img):
         """
-        Detect license plate regions and extract text
+        Detect license plate regions and extract text.
+        Returns the results plus the full-resolution grayscale frame
+        so callers can crop plates without converting again.
         """
-        contours, gray = self.get_contours(img)
+        contours, areas, scale, gray = self.get_contours(img)
+        candidates = []
         results = []
 
-        for c in contours:
-            # Ignore very small contours (noise)
-            area = cv2.contourArea(c)
-            if area < 300:
-                continue
+        # Cheap checks first, for all contours at once: bounding box aspect
+        # ratio and size (300 px at full resolution)
+        rects = np.array(
+            [cv2.boundingRect(c) for c in contours],
+            dtype=np.int32
+        ).reshape(-1, 4)
+        keep = filter_candidates(rects, areas, 300 / (scale * scale))
+
+        for i in np.flatnonzero(keep):
+            c = contours[i]
+            x, y, w, h = rects[i].tolist()
 
             # Approximate contour shape
             peri = cv2.arcLength(c, True)
             approx = cv2.approxPolyDP(c, 0.02 * peri, True)
 
             # License plates usually have 4–8 corners
-            if 4 <= len(approx) <= 8:
-                x, y, w, h = cv2.boundingRect(c)
-
-                # Width-to-height ratio check
-                aspect_ratio = w / float(h)
-                if 1.5 <= aspect_ratio <= 8.0:
-
-                    # Extract region of interest (ROI)
-                    roi = gray[y:y+h, x:x+w]
-                    if roi.size == 0:
-                        continue
-
-                    # Enlarge ROI for better OCR accuracy
-                    roi = cv2.resize(
-                        roi, None,
-                        fx=3, fy=3,
-                        interpolation=cv2.INTER_CUBIC
-                    )
-
-                    # Convert ROI to binary image
-                    _, roi_thresh = cv2.threshold(
-                        roi, 0, 255,
-                        cv2.THRESH_BINARY + cv2.THRESH_OTSU
-                    )
-
-                    # Extract text using Tesseract OCR
-                    text = pytesseract.image_to_string(
-                        roi_thresh,
-                        config=self.custom_config
-                    ).strip()
-
-                    # Remove unwanted characters
-                    clean_text = re.sub(
-                        r'[^A-Z0-9]', '',
-                        text.upper()
-                    )
-
-                    # Store valid plate numbers
-                    if len(clean_text) >= 4:
-                        results.append({
-                            'bbox': (x, y, w, h),
-                            'text': clean_text
-                        })
+            if not 4 <= len(approx) <= 8:
+                continue
+
+            # Map the box back to full-resolution coordinates
+            x, y, w, h = x * scale, y * scale, w * scale, h * scale
+
+            # Extract region of interest (ROI)
+            roi = gray[y:y+h, x:x+w]
+            if roi.size == 0:
+                continue
+
+            # Enlarge ROI for better OCR accuracy; linear interpolation is
+            # plenty once the ROI is binarized (the saved plate keeps cubic)
+            roi = cv2.resize(
+                roi, (max(120, w * 2), max(60, h * 2)),
+                interpolation=cv2.INTER_LINEAR
+            )
+
+            # Convert ROI to binary image
+            _, roi_thresh = cv2.threshold(
+                roi, 0, 255,
+                cv2.THRESH_BINARY + cv2.THRESH_OTSU
+            )
+
+            # Queue ROI for OCR
+            candidates.append(((x, y, w, h), roi_thresh))
+
+        # Look up every ROI in the OCR cache; only unseen ROIs go to
+        # Tesseract, all of them in parallel
+        keys = []
+        hits = {}
+        pending = {}
+        for _, roi_thresh in candidates:
+            key = cv2.resize(
+                roi_thresh, (8, 8),
+                interpolation=cv2.INTER_AREA
+            ).tobytes()
+            keys.append(key)
+
+            # Hits are read now: storing new results below may evict them
+            if key in self._ocr_cache:
+                self._ocr_cache.move_to_end(key)
+                hits[key] = self._ocr_cache[key]
+            elif key not in pending:
+                pending[key] = self.ocr_pool.submit(self.read_text, roi_thresh)
+
+        # Collect in candidate order so larger contours still win deduplication
+        for (bbox, _), key in zip(candidates, keys):
+            if key in pending:
+                text = pending[key].result().strip()
+                self._ocr_cache[key] = text
+                if len(self._ocr_cache) > OCR_CACHE_SIZE:
+                    self._ocr_cache.popitem(last=False)
+            else:
+                text = hits[key]
+
+            # Remove unwanted characters
+            clean_text = _PLATE_RE.sub('', text.upper())
+
+            # Store valid plate numbers
+            if len(clean_text) >= 4:
+                results.append({
+                    'bbox': bbox,
+                    'text': clean_text
+                })
 
         # Remove duplicate detections
-        seen = set()
-        unique_results = []
-        for r in results:
-            if r['text'] not in seen:
-                unique_results.append(r)
-                seen.add(r['text'])
+        return dedupe_by_text(results), gray
 
-        return unique_results
+
+    def read_text(self, roi):
+        """
+        Run OCR on a binarized ROI and return the raw text
+        """
+        if PyTessBaseAPI is None:
+            return pytesseract.image_to_string(roi, config=self.custom_config)
+
+        # Same settings as custom_config, loaded once per worker thread
+        api = getattr(self._tess_local, 'api', None)
+        if api is None:
+            api = PyTessBaseAPI(psm=PSM.SINGLE_LINE, oem=OEM.DEFAULT)
+            api.SetVariable('tessedit_char_whitelist', PLATE_CHARS)
+            self._tess_local.api = api
+            self._tess_apis.append(api)
+
+        height, width = roi.shape
+        api.SetImageBytes(roi.tobytes(), width, height, 1, width)
+        return api.GetUTF8Text()
 
 
     def draw_results(self, img, results):
@@ -168,6 +404,38 @@ class RobustLicensePlateRecognizer:
         return img
 
 
+    def close(self):
+        """
+        Stop the OCR worker threads and release their Tesseract handles
+        """
+        self.ocr_pool.shutdown(wait=True)
+        for api in self._tess_apis:
+            api.End()
+        self._tess_apis.clear()
+
+
+def save_worker(save_queue):
+    """
+    Write (filename, image) pairs from the queue to disk
+    until a None sentinel is received
+    """
+    while True:
+        item = save_queue.get()
+        if item is None:
+            break
+        save_name, img = item
+
+        try:
+            saved = cv2.imwrite(save_name, img)
+        except cv2.error:
+            saved = False
+
+        if saved:
+            print(f"Saved: {save_name}")
+        else:
+            print(f"❌ Failed to save: {save_name}")
+
+
 # ---------- MAIN PROGRAM ----------
 if __name__ == "__main__":
 
@@ -199,6 +467,9 @@ if __name__ == "__main__":
         exit(1)
 
     # Set camera properties for better performance
+    # MJPEG must be requested before the resolution; compressed frames use far
+    # less USB bandwidth than raw YUYV and decode quickly with libjpeg-turbo
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
     cap.set(cv2.CAP_PROP_FPS, 30)
@@ -212,9 +483,19 @@ if __name__ == "__main__":
     print("Waiting for license plates...")
     print("="*60 + "\n")
 
+    # Plate images are written by a background thread so disk I/O
+    # never stalls the camera loop
+    save_queue = queue.Queue()
+    saver = threading.Thread(
+        target=save_worker, args=(save_queue,), daemon=True
+    )
+    saver.start()
+
     frame_count = 0
     detected_plates = {}
     last_detected_plate = None
+    results = []
+    prev_small = None
 
     try:
         while True:
@@ -227,14 +508,31 @@ if __name__ == "__main__":
             frame_count += 1
             display_frame = frame.copy()
 
-            # Process frame for license plates
-            results = recognizer.process_image(frame)
+            # Tiny grayscale thumbnail to measure how much the scene changed
+            small = cv2.cvtColor(
+                cv2.resize(frame, (160, 90), interpolation=cv2.INTER_AREA),
+                cv2.COLOR_BGR2GRAY
+            )
+            motion = (
+                cv2.absdiff(small, prev_small).mean()
+                if prev_small is not None else float('inf')
+            )
+            run_detection = (
+                frame_count % DETECT_EVERY_N_FRAMES == 0
+                or motion > MOTION_THRESHOLD
+            )
+
+            # Process frame for license plates (grayscale frame is reused
+            # below); skipped frames keep showing the last detections
+            if run_detection:
+                results, gray = recognizer.process_image(frame)
+                prev_small = small
 
             # Draw rectangles on main frame
             display_frame = recognizer.draw_results(display_frame, results)
 
             # If license plate detected
-            if results:
+            if run_detection and results:
                 for r in results:
                     x, y, w, h = r['bbox']
                     plate_text = r['text']
@@ -251,7 +549,6 @@ if __name__ == "__main__":
                         print("-"*60)
 
                         # Extract plate region in grayscale
-                        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
                         plate_region = gray[y:y+h, x:x+w]
 
                         if plate_region.size > 0:
@@ -279,8 +576,7 @@ if __name__ == "__main__":
 
                             # Save this detection
                             save_name = f"plate_detected_{plate_text}_{frame_count}.jpg"
-                            cv2.imwrite(save_name, plate_with_text)
-                            print(f"Saved: {save_name}")
+                            save_queue.put((save_name, plate_with_text))
 
                             # Display in popup
                             cv2.imshow("📋 DETECTED LICENSE PLATE (GRAYSCALE)", plate_with_text)
@@ -312,6 +608,10 @@ if __name__ == "__main__":
         cap.release()
         cv2.destroyAllWindows()
 
+        # Let the writer flush pending plate images
+        save_queue.put(None)
+        saver.join()
+
         # Final summary
         print("\n" + "="*60)
         print("📊 SESSION SUMMARY")
@@ -346,7 +646,7 @@ if __name__ == "__main__":
             frame_count += 1
 
             # Process frame for license plates
-            results = recognizer.process_image(frame)
+            results, gray = recognizer.process_image(frame)
 
             # Draw detected plates with green rectangles
             display_frame = frame.copy()
@@ -359,8 +659,8 @@ if __name__ == "__main__":
                     plate_text = r['text']
                     detected_plates[plate_text] = detected_plates.get(plate_text, 0) + 1
 
-                    # Extract the plate region from grayscale image
-                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                    # Extract the plate region from the recognizer's
+                    # grayscale image
                     plate_region = gray[y:y+h, x:x+w]
 
                     # Create a grayscale image with the plate text displayed
@@ -403,9 +703,10 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         print("\nInterrupted by user")
     finally:
-        # Release resources
+        # Release resources (this is the recognizer's last use)
         cap.release()
         cv2.destroyAllWindows()
+        recognizer.close()
 
         # Print summary
         print("\n" + "="*50)
@@ -0,0 +1,97 @@
+import cv2
+import numpy as np
+
+
+def square(size):
+    return np.array(
+        [[[0, 0]], [[size, 0]], [[size, size]], [[0, size]]],
+        dtype=np.int32
+    )
+
+
+def test_largest_contours_sorted_and_truncated(main):
+    rng = np.random.default_rng(0)
+    sizes = rng.permutation(np.arange(1, 101))
+    cnts = [square(int(s)) for s in sizes]
+
+    largest, areas = main.largest_contours(cnts, 30)
+
+    expected = sorted(cnts, key=cv2.contourArea, reverse=True)[:30]
+    assert len(largest) == 30
+    assert [cv2.contourArea(c) for c in largest] == [
+        cv2.contourArea(c) for c in expected
+    ]
+    np.testing.assert_array_equal(
+        areas, [cv2.contourArea(c) for c in expected]
+    )
+
+
+def test_largest_contours_fewer_than_k(main):
+    cnts = [square(3), square(10), square(5)]
+
+    largest, areas = main.largest_contours(cnts, 30)
+
+    assert [int(a) for a in areas] == [100, 25, 9]
+    assert largest[0] is cnts[1]
+
+
+def test_largest_contours_empty(main):
+    largest, areas = main.largest_contours((), 30)
+
+    assert largest == []
+    assert areas.dtype == np.float32 and areas.size == 0
+
+
+def test_filter_candidates_aspect_and_area(main):
+    rects = np.array([
+        [0, 0, 30, 20],     # aspect 1.5, lower bound
+        [0, 0, 80, 10],     # aspect 8.0, upper bound
+        [0, 0, 29, 20],     # aspect below 1.5
+        [0, 0, 81, 10],     # aspect above 8.0
+        [0, 0, 40, 10],     # plate-like but area too small
+    ], dtype=np.int32)
+    areas = np.array([100, 100, 100, 100, 74], dtype=np.float32)
+
+    keep = main.filter_candidates(rects, areas, 75.0)
+
+    assert keep.dtype == np.bool_
+    assert keep.tolist() == [True, True, False, False, False]
+
+
+def test_filter_candidates_empty(main):
+    keep = main.filter_candidates(
+        np.empty((0, 4), dtype=np.int32),
+        np.empty(0, dtype=np.float32),
+        75.0
+    )
+
+    assert keep.size == 0
+
+
+def test_main_loads_under_another_module_name(main, tmp_path):
+    # The fixture already loaded (and compiled) main.py as "main"; a fresh
+    # interpreter, without the repository on sys.path, must still be able
+    # to load it under a different name
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    main_path = Path(__file__).resolve().parents[1] / "main.py"
+    code = (
+        "import importlib.util, numpy as np\n"
+        f"spec = importlib.util.spec_from_file_location("
+        f"'plate_main', {str(main_path)!r})\n"
+        "module = importlib.util.module_from_spec(spec)\n"
+        "spec.loader.exec_module(module)\n"
+        "print(module.filter_candidates(\n"
+        "    np.array([[0, 0, 40, 10]], dtype=np.int32),\n"
+        "    np.array([100], dtype=np.float32), 75.0).tolist())\n"
+    )
+
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=tmp_path, capture_output=True, text=True
+    )
+
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == "[True]"
@@ -0,0 +1,14 @@
+import cv2
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("shape", [(90, 160), (5, 5), (4, 4), (1, 1)])
+@pytest.mark.parametrize("use_umat", [False, True])
+def test_histogram_median_matches_numpy(main, shape, use_umat):
+    rng = np.random.default_rng(0)
+    for high in (2, 17, 256):
+        img = rng.integers(0, high, shape, dtype=np.uint8)
+        src = cv2.UMat(img) if use_umat else img
+
+        assert main.histogram_median(src) == np.median(img)
@@ -0,0 +1,69 @@
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+
+def plate_frame():
+    img = np.full((720, 1280, 3), 90, dtype=np.uint8)
+    cv2.rectangle(img, (500, 300), (800, 380), (255, 255, 255), -1)
+    cv2.rectangle(img, (500, 300), (800, 380), (0, 0, 0), 3)
+    cv2.putText(
+        img, "AB1234", (520, 365),
+        cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 0), 5
+    )
+    return img
+
+
+@pytest.fixture
+def ocr_calls(main, monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def fake_image_to_string(roi, config=''):
+        with lock:
+            calls.append(roi.shape)
+        return 'AB 1234\n'
+
+    # Force the pytesseract path even when tesserocr is installed
+    monkeypatch.setattr(main, 'PyTessBaseAPI', None)
+    monkeypatch.setattr(
+        main.pytesseract, 'image_to_string', fake_image_to_string
+    )
+    return calls
+
+
+def test_ocr_cache_hit_skips_tesseract(main, ocr_calls):
+    recognizer = main.RobustLicensePlateRecognizer()
+    frame = plate_frame()
+    try:
+        first, _ = recognizer.process_image(frame)
+        misses = len(ocr_calls)
+        second, _ = recognizer.process_image(frame)
+    finally:
+        recognizer.close()
+
+    assert misses > 0
+    assert len(recognizer._ocr_cache) == misses
+    assert len(ocr_calls) == misses
+    assert first == second
+    assert [r['text'] for r in first] == ['AB1234']
+
+
+def test_ocr_cache_evicts_oldest(main, ocr_calls, monkeypatch):
+    monkeypatch.setattr(main, 'OCR_CACHE_SIZE', 1)
+    recognizer = main.RobustLicensePlateRecognizer()
+    frame = plate_frame()
+    try:
+        recognizer.process_image(frame)
+        misses = len(ocr_calls)
+        recognizer.process_image(frame)
+    finally:
+        recognizer.close()
+
+    # Several distinct ROIs, but only the newest result is remembered,
+    # so the second frame misses on all but that one
+    assert misses > 1
+    assert len(recognizer._ocr_cache) == 1
+    assert len(ocr_calls) == 2 * misses - 1
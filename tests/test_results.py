@@ -0,0 +1,18 @@
+def test_dedupe_by_text_keeps_first_in_order(main):
+    results = [
+        {'bbox': (0, 0, 200, 50), 'text': 'AB1234'},
+        {'bbox': (10, 10, 90, 30), 'text': 'XY9876'},
+        {'bbox': (5, 5, 100, 25), 'text': 'AB1234'},
+        {'bbox': (20, 20, 60, 20), 'text': 'CD5555'},
+        {'bbox': (30, 30, 40, 15), 'text': 'XY9876'},
+    ]
+
+    unique = main.dedupe_by_text(results)
+
+    assert [r['text'] for r in unique] == ['AB1234', 'XY9876', 'CD5555']
+    assert unique[0] is results[0]
+    assert unique[1] is results[1]
+
+
+def test_dedupe_by_text_empty(main):
+    assert main.dedupe_by_text([]) == []
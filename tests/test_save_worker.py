@@ -0,0 +1,29 @@
+import queue
+
+import cv2
+import numpy as np
+
+
+def test_save_worker_writes_until_sentinel(main, tmp_path, capsys):
+    img = np.full((20, 40), 128, dtype=np.uint8)
+    good = tmp_path / "plate_ok.jpg"
+    bad = tmp_path / "missing_dir" / "plate_bad.jpg"
+    after = tmp_path / "plate_after_sentinel.jpg"
+
+    save_queue = queue.Queue()
+    save_queue.put((str(good), img))
+    save_queue.put((str(bad), img))
+    save_queue.put(None)
+    save_queue.put((str(after), img))
+
+    # Runs synchronously and must return at the sentinel
+    main.save_worker(save_queue)
+
+    assert cv2.imread(str(good), cv2.IMREAD_GRAYSCALE).shape == (20, 40)
+    assert not bad.exists()
+    assert not after.exists()
+    assert save_queue.qsize() == 1
+
+    out = capsys.readouterr().out
+    assert f"Saved: {good}" in out
+    assert f"Failed to save: {bad}" in out
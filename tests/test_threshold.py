@@ -0,0 +1,48 @@
+import cv2
+import numpy as np
+import pytest
+
+
+def reference(img):
+    return cv2.adaptiveThreshold(
+        img, 255,
+        cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+        cv2.THRESH_BINARY,
+        11, 2
+    )
+
+
+@pytest.mark.parametrize("name", ["dark", "random", "blurred"])
+@pytest.mark.parametrize("use_umat", [False, True])
+def test_adaptive_threshold_matches_opencv(main, name, use_umat):
+    rng = np.random.default_rng(0)
+    img = {
+        # Local mean below C: adaptiveThreshold returns all white here
+        "dark": rng.integers(0, 2, (90, 160), dtype=np.uint8),
+        "random": rng.integers(0, 256, (90, 160), dtype=np.uint8),
+        "blurred": cv2.GaussianBlur(
+            rng.integers(0, 256, (90, 160), dtype=np.uint8), (5, 5), 0
+        ),
+    }[name]
+    kernel = cv2.getGaussianKernel(11, 0, cv2.CV_32F)
+
+    src = cv2.UMat(img) if use_umat else img
+    result = main.adaptive_threshold(src, kernel, 2)
+    if use_umat:
+        result = result.get()
+
+    np.testing.assert_array_equal(result, reference(img))
+
+
+def test_adaptive_threshold_uses_buffers(main):
+    img = np.random.default_rng(1).integers(0, 256, (90, 160), np.uint8)
+    mean = np.empty_like(img)
+    dst = np.empty_like(img)
+
+    result = main.adaptive_threshold(
+        img, cv2.getGaussianKernel(11, 0, cv2.CV_32F), 2,
+        mean=mean, dst=dst
+    )
+
+    assert result is dst
+    np.testing.assert_array_equal(dst, reference(img))